@@ -1,7 +1,14 @@
 from .graph_generator import Knowledge_Graph
+from .sqlite_store import SQLite_Store
 from neo4j import GraphDatabase
+from collections import Counter
+from typing import Dict, List, Tuple, Optional
 import networkx as nx
+import contextlib
+import hashlib
 import logging
+import json
+import os
 
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -10,89 +17,286 @@ logging.basicConfig(
 logging.getLogger("matplotlib").setLevel(logging.WARNING)
 logging.getLogger("numexpr").setLevel(logging.WARNING)
 
+"""
+A Cypher query and the rows it is run with
+"""
+Batch = Tuple[str, List[Dict]]
+
 
 class builder:
     """
-    Generates a knowledge graph and builds it into a Neo4j database as well as store dump into postgres
+    Generates a knowledge graph and builds it into a Neo4j database or an embedded SQLite store
     """
 
-    def __init__(self, root_path: str, uri: str, username: str, password: str):
+    def __init__(
+        self,
+        root_path: str,
+        uri: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        store: Optional[SQLite_Store] = None,
+        checkpoint_path: str = ".neo4j_checkpoint.json",
+        batch_size: int = 1000,
+    ):
         self.knowledge_graph: nx.DiGraph = Knowledge_Graph(root_path)
         self.knowledge_graph.generate_unified_graph()
         self.knowledge_graph = self.knowledge_graph.graph
-        self.driver = GraphDatabase.driver(uri, auth=(username, password))
+        self.store: Optional[SQLite_Store] = store
+        self.checkpoint_path: str = checkpoint_path
+        self.batch_size: int = batch_size
+        self.load_plan: Optional[Tuple[List[Batch], str]] = None
+        self.driver = (
+            GraphDatabase.driver(uri, auth=(username, password)) if uri else None
+        )
+
+    def node_label(self, attrs: Dict) -> str:
+        """
+        Neo4j label of a node, taken from its type.
+        """
+        return attrs.get("type") or "Node"
+
+    def relationship_type(self, attrs: Dict) -> str:
+        """
+        Neo4j relationship type of an edge, taken from its type.
+        """
+        return attrs.get("type") or "CONNECTED"
+
+    def neo4j_batches(self) -> List[Batch]:
+        """
+        Splits the graph into deterministic batches of idempotent MERGE queries.
+        Nodes are batched per label and edges per (source label, relationship type, target label),
+        so every MATCH can use the name index of its label.
+
+        Returns:
+            List[Batch]: (query, rows) pairs, all node batches before the edge batches.
+        """
+        graph = self.knowledge_graph
+        nodes: Dict[str, List[Dict]] = {}
+        for node_name, attrs in graph.nodes(data=True):
+            properties = {key: value for key, value in attrs.items() if key != "type"}
+            nodes.setdefault(self.node_label(attrs), []).append(
+                {"name": node_name, "properties": properties}
+            )
+
+        edges: Dict[Tuple[str, str, str], List[Dict]] = {}
+        for u, v, attrs in graph.edges(data=True):
+            group = (
+                self.node_label(graph.nodes[u]),
+                self.relationship_type(attrs),
+                self.node_label(graph.nodes[v]),
+            )
+            properties = {key: value for key, value in attrs.items() if key != "type"}
+            edges.setdefault(group, []).append(
+                {"source": u, "target": v, "properties": properties}
+            )
 
-    def load_networkx_to_neo4j(self) -> None:
+        batches: List[Batch] = []
+        for label in sorted(nodes):
+            query = (
+                f"UNWIND $rows AS row MERGE (n:`{label}` {{name: row.name}}) "
+                "SET n += row.properties"
+            )
+            rows = sorted(nodes[label], key=lambda row: str(row["name"]))
+            for i in range(0, len(rows), self.batch_size):
+                batches.append((query, rows[i : i + self.batch_size]))
+
+        for source_label, relationship, target_label in sorted(edges):
+            query = (
+                f"UNWIND $rows AS row "
+                f"MATCH (a:`{source_label}` {{name: row.source}}), (b:`{target_label}` {{name: row.target}}) "
+                f"MERGE (a)-[r:`{relationship}`]->(b) SET r += row.properties"
+            )
+            rows = sorted(
+                edges[(source_label, relationship, target_label)],
+                key=lambda row: (str(row["source"]), str(row["target"])),
+            )
+            for i in range(0, len(rows), self.batch_size):
+                batches.append((query, rows[i : i + self.batch_size]))
+
+        return batches
+
+    def graph_fingerprint(self, batches: List[Batch]) -> str:
+        """
+        Fingerprints the batches, a checkpoint is only resumed for the exact same batches.
+        """
+        digest = hashlib.sha1()
+        for query, rows in batches:
+            digest.update(query.encode())
+            digest.update(json.dumps(rows, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def neo4j_load_plan(self) -> Tuple[List[Batch], str]:
         """
-        Loads a NetworkX graph into a Neo4j database.
+        Computes the batches and their fingerprint once, both are reused by `can_resume` and the load.
+
+        Returns:
+            Tuple[List[Batch], str]: the batches of `neo4j_batches` and their fingerprint.
+        """
+        if self.load_plan is None:
+            batches = self.neo4j_batches()
+            self.load_plan = (batches, self.graph_fingerprint(batches))
+        return self.load_plan
+
+    def read_checkpoint(self, fingerprint: str) -> int:
+        """
+        Reads the number of batches committed by a previous load of the same graph.
+
+        Returns:
+            int: the number of committed batches, 0 if there is nothing to resume.
         """
         try:
-            logging.info("Loading NetworkX graph into Neo4j database.")
-            with self.driver.session() as session:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return 0
 
-                for node_name, attrs in self.knowledge_graph.nodes(data=True):
-                    node_type = attrs.get("type", "Node")
+        if checkpoint.get("fingerprint") != fingerprint:
+            logging.info("Checkpoint belongs to a different graph, starting over.")
+            return 0
+        return checkpoint.get("completed_batches", 0)
 
-                    # Prepare dynamic properties dictionary for Cypher query
-                    properties = {
-                        key: value for key, value in attrs.items() if key != "type"
-                    }
+    def write_checkpoint(self, fingerprint: str, completed_batches: int) -> None:
+        """
+        Records the number of committed batches, replacing the checkpoint file atomically.
+        """
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(
+                {"fingerprint": fingerprint, "completed_batches": completed_batches}, f
+            )
+        os.replace(temporary_path, self.checkpoint_path)
 
-                    # Convert the properties into a Neo4j-friendly format (Cypher)
-                    set_properties = ", ".join([f"{key}: ${key}" for key in properties])
+    def can_resume(self) -> bool:
+        """
+        Checks whether a previous load of the same graph left a checkpoint to resume from.
+        """
+        _, fingerprint = self.neo4j_load_plan()
+        return self.read_checkpoint(fingerprint) > 0
 
-                    # MERGE to avoid creating duplicates
-                    session.run(
-                        f"MERGE (n:{node_type} {{name: $name}}) SET n += {{ {set_properties} }}",
-                        name=node_name,
-                        **properties,
-                    )
+    def create_neo4j_indexes(self, session) -> None:
+        """
+        Creates a name index for every node label so the MERGE and MATCH lookups do not scan.
+        """
+        labels = {self.node_label(attrs) for _, attrs in self.knowledge_graph.nodes(data=True)}
+        for label in sorted(labels):
+            session.run(
+                f"CREATE INDEX IF NOT EXISTS FOR (n:`{label}`) ON (n.name)"
+            ).consume()
 
-                for u, v in self.knowledge_graph.edges():
-                    session.run(
-                        """
-                        MATCH (a {name: $name1}), (b {name: $name2})
-                        MERGE (a)-[:CONNECTED]->(b)
-                        """,
-                        name1=u,
-                        name2=v,
-                    )
+    def load_networkx_to_neo4j(self) -> bool:
+        """
+        Loads a NetworkX graph into a Neo4j database in checkpointed batches.
+        Every batch is an idempotent MERGE committed on its own, a failed load is resumed
+        from the last committed batch on the next run.
+
+        Returns:
+            bool: true if the whole graph is loaded, false otherwise
+        """
+        batches, fingerprint = self.neo4j_load_plan()
+        completed = self.read_checkpoint(fingerprint)
 
+        try:
+            logging.info(
+                f"Loading NetworkX graph into Neo4j database, resuming at batch {completed} of {len(batches)}."
+            )
+            with self.driver.session() as session:
+                self.create_neo4j_indexes(session)
+
+                for i in range(completed, len(batches)):
+                    query, rows = batches[i]
+                    session.run(query, rows=rows).consume()
+                    self.write_checkpoint(fingerprint, i + 1)
+
+            # Nothing was checkpointed when there were no batches left to run
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.checkpoint_path)
             logging.info("NetworkX graph loaded into Neo4j database successfully.")
+            return True
 
         except Exception as e:
-            logging.error(f"Error loading NetworkX graph into Neo4j database: {e}")
+            logging.error(
+                f"Error loading NetworkX graph into Neo4j database, rerun to resume: {e}"
+            )
+            return False
 
-    def verify_neo4j_graph(self) -> None:
+    def expected_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Counts the nodes per label and the edges per relationship type of the NetworkX graph.
         """
-        Verifies the Neo4j graph by checking the number of nodes and edges.
+        labels = Counter(
+            self.node_label(attrs) for _, attrs in self.knowledge_graph.nodes(data=True)
+        )
+        relationships = Counter(
+            self.relationship_type(attrs)
+            for _, _, attrs in self.knowledge_graph.edges(data=True)
+        )
+        return {"labels": dict(labels), "relationships": dict(relationships)}
+
+    def verify_neo4j_graph(self) -> bool:
+        """
+        Verifies the Neo4j graph by comparing the expected and actual number of nodes per label
+        and edges per relationship type.
+
+        Returns:
+            bool: true if every count matches, false otherwise
         """
         try:
             logging.info("Verifying Neo4j graph.")
+            expected = self.expected_counts()
+            matches = True
             with self.driver.session() as session:
 
-                result = session.run("MATCH (n) RETURN count(n) as count")
-                node_count = result.single()[0]
+                for label, count in sorted(expected["labels"].items()):
+                    result = session.run(f"MATCH (n:`{label}`) RETURN count(n) as count")
+                    actual = result.single()[0]
+                    if actual != count:
+                        logging.error(
+                            f"Label {label} has {actual} nodes, expected {count}."
+                        )
+                        matches = False
 
-                result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-                edge_count = result.single()[0]
+                for relationship, count in sorted(expected["relationships"].items()):
+                    result = session.run(
+                        f"MATCH ()-[r:`{relationship}`]->() RETURN count(r) as count"
+                    )
+                    actual = result.single()[0]
+                    if actual != count:
+                        logging.error(
+                            f"Relationship {relationship} has {actual} edges, expected {count}."
+                        )
+                        matches = False
+
+            if matches:
                 logging.info(
-                    f"Neo4j graph has {node_count} nodes and {edge_count} edges."
+                    f"Neo4j graph matches with {self.knowledge_graph.number_of_nodes()} nodes "
+                    f"and {self.knowledge_graph.number_of_edges()} edges."
                 )
+            return matches
 
         except Exception as e:
             logging.error(f"Error verifying Neo4j graph: {e}")
+            return False
 
     def close(self) -> None:
         """
-        Closes the Neo4j driver.
+        Closes the Neo4j driver. The SQLite store is owned by the caller and stays open for queries.
         """
-        self.driver.close()
+        if self.driver is not None:
+            self.driver.close()
 
     def build(self) -> None:
         """
-        Builds the knowledge graph into a Neo4j database.
+        Builds the knowledge graph into the SQLite store if one is given, the Neo4j database otherwise.
         """
-        self.load_networkx_to_neo4j()
-        self.verify_neo4j_graph()
+        if self.store is not None:
+            if self.store.load_networkx(self.knowledge_graph):
+                self.store.verify()
+            self.close()
+            return
+
+        if self.load_networkx_to_neo4j():
+            self.verify_neo4j_graph()
         self.close()
@@ -1,7 +1,7 @@
 import ast
 import os
 import logging
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 import pickle
 
 logging.basicConfig(
@@ -11,10 +11,50 @@ logging.basicConfig(
 """
 Generate typing for the metadata and type safety
 """
-FunctionInfo = Dict[str, Union[str, List[str]]]
-ClassInfo = Dict[str, Union[str, List[str]]]
+ParameterInfo = Dict[str, Optional[str]]
+MetricsInfo = Dict[str, int]
+FunctionInfo = Dict[str, Union[str, List[str], List[ParameterInfo], MetricsInfo]]
+ClassInfo = Dict[str, Union[str, List[str], MetricsInfo]]
 FileMetadata = Dict[str, Union[List[FunctionInfo], List[ClassInfo], List[str], bool]]
 
+"""
+Nodes adding a branch to the cyclomatic complexity, and nodes opening a nested block
+"""
+BRANCH_NODES = (
+    ast.If,
+    ast.IfExp,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.ExceptHandler,
+    ast.Assert,
+    ast.match_case,
+)
+BLOCK_NODES = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.With,
+    ast.AsyncWith,
+    ast.Try,
+    ast.Match,
+)
+
+
+def empty_metadata() -> FileMetadata:
+    """
+    Returns the metadata of a file with nothing extracted from it.
+    """
+    return {
+        "functions": [],
+        "classes": [],
+        "imports": [],
+        "variables": [],
+        "inheritance": [],
+        "syntax_error": False,
+    }
+
 
 class Python_Extractor:
     """
@@ -44,14 +84,7 @@ class Python_Extractor:
         Returns:
             FileMetadata: A dictionary containing metadata about the file.
         """
-        metadata: FileMetadata = {
-            "functions": [],
-            "classes": [],
-            "imports": [],
-            "variables": [],
-            "inheritance": [],
-            "syntax_error": False,
-        }
+        metadata: FileMetadata = empty_metadata()
 
         if not os.path.exists(file):
             logging.error(f"Error: {file} does not exist.")
@@ -65,13 +98,36 @@ class Python_Extractor:
             with open(file) as f:
                 file_content = f.read()
 
-            parsed_ast = ast.parse(file_content)
+        except Exception as e:
+            logging.error(f"Error reading file {file}: {e}")
+            return metadata
+
+        return self.track_source_metadata(file_content, file)
+
+    def track_source_metadata(self, source: str, file: str) -> FileMetadata:
+        """
+        Track metadata for functions, classes, imports, and variables in Python source code.
+
+        Args:
+            source (str): The Python source code to be parsed.
+            file (str): The path the source was read from, used for logging.
+
+        Returns:
+            FileMetadata: A dictionary containing metadata about the source.
+        """
+        metadata: FileMetadata = empty_metadata()
+
+        try:
+            parsed_ast = ast.parse(source)
 
             for node in ast.walk(parsed_ast):
                 if isinstance(node, ast.FunctionDef):
                     function_info: FunctionInfo = {
                         "name": node.name,
                         "args": [arg.arg for arg in node.args.args],
+                        "params": self.track_parameters(node.args),
+                        "metrics": self.track_metrics(node),
+                        "calls": self.track_calls(node),
                     }
                     metadata["functions"].append(function_info)
 
@@ -86,6 +142,7 @@ class Python_Extractor:
                             for method in node.body
                             if isinstance(method, ast.FunctionDef)
                         ],
+                        "metrics": self.track_metrics(node),
                     }
                     metadata["classes"].append(class_info)
                     metadata["inheritance"].extend(class_info["bases"])
@@ -112,6 +169,137 @@ class Python_Extractor:
             logging.error(f"Error reading file {file}: {e}")
             return metadata
 
+    def track_parameters(self, arguments: ast.arguments) -> List[ParameterInfo]:
+        """
+        Track the full signature of a function as one record per parameter.
+
+        Args:
+            arguments (ast.arguments): The arguments node of the function.
+
+        Returns:
+            List[ParameterInfo]: The parameters in declaration order, each with its
+                "name", "kind" (positional_only, positional, vararg, keyword_only or varkw),
+                and "annotation" and "default" as source code or None.
+        """
+
+        def parameter(
+            arg: ast.arg, kind: str, default: Optional[ast.expr] = None
+        ) -> ParameterInfo:
+            return {
+                "name": arg.arg,
+                "kind": kind,
+                "annotation": ast.unparse(arg.annotation) if arg.annotation else None,
+                "default": ast.unparse(default) if default else None,
+            }
+
+        positional = arguments.posonlyargs + arguments.args
+        # Defaults belong to the last positional parameters
+        defaults = [None] * (len(positional) - len(arguments.defaults)) + list(
+            arguments.defaults
+        )
+
+        parameters = [
+            parameter(
+                arg,
+                "positional_only" if i < len(arguments.posonlyargs) else "positional",
+                defaults[i],
+            )
+            for i, arg in enumerate(positional)
+        ]
+        if arguments.vararg:
+            parameters.append(parameter(arguments.vararg, "vararg"))
+        parameters.extend(
+            parameter(arg, "keyword_only", default)
+            for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults)
+        )
+        if arguments.kwarg:
+            parameters.append(parameter(arguments.kwarg, "varkw"))
+
+        return parameters
+
+    def track_metrics(self, definition: Union[ast.FunctionDef, ast.ClassDef]) -> MetricsInfo:
+        """
+        Track the complexity metrics of a function or class definition.
+        Nested functions and classes are tracked on their own and left out of the metrics of their parent,
+        except that a class's complexity is the sum of the complexities of its methods.
+
+        Args:
+            definition (ast.FunctionDef | ast.ClassDef): The definition to be measured.
+
+        Returns:
+            MetricsInfo: The "complexity" (cyclomatic), "nesting" (deepest nested block) and "loc" (lines spanned).
+        """
+        complexity = 0 if isinstance(definition, ast.ClassDef) else 1
+        nesting = 0
+        stack = [(child, 0) for child in ast.iter_child_nodes(definition)]
+
+        while stack:
+            node, depth = stack.pop()
+            if isinstance(node, ast.ClassDef):
+                continue
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if isinstance(definition, ast.ClassDef) and isinstance(
+                    node, ast.FunctionDef
+                ):
+                    complexity += self.track_metrics(node)["complexity"]
+                continue
+
+            if isinstance(node, BRANCH_NODES):
+                complexity += 1
+            elif isinstance(node, ast.BoolOp):
+                complexity += len(node.values) - 1
+            elif isinstance(node, ast.comprehension):
+                complexity += 1 + len(node.ifs)
+
+            child_depth = depth
+            if isinstance(node, BLOCK_NODES):
+                child_depth += 1
+                nesting = max(nesting, child_depth)
+
+            for child in ast.iter_child_nodes(node):
+                # An `elif` is an If nested in the orelse of its parent, but sits at the same depth
+                is_elif = (
+                    isinstance(node, ast.If)
+                    and isinstance(child, ast.If)
+                    and node.orelse == [child]
+                )
+                stack.append((child, depth if is_elif else child_depth))
+
+        return {
+            "complexity": complexity,
+            "nesting": nesting,
+            "loc": definition.end_lineno - definition.lineno + 1,
+        }
+
+    def track_calls(self, definition: ast.FunctionDef) -> List[str]:
+        """
+        Track the names a function calls, e.g. `helper` for `helper(x)` and `save` for `self.save()`.
+        Calls made by nested functions and classes are tracked on those instead.
+
+        Args:
+            definition (ast.FunctionDef): The function to be scanned.
+
+        Returns:
+            List[str]: The sorted called names, without duplicates.
+        """
+        calls = set()
+        stack = list(ast.iter_child_nodes(definition))
+
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+
+            if isinstance(node, ast.Call):
+                if isinstance(node.func, ast.Name):
+                    calls.add(node.func.id)
+                elif isinstance(node.func, ast.Attribute):
+                    calls.add(node.func.attr)
+
+            stack.extend(ast.iter_child_nodes(node))
+
+        return sorted(calls)
+
     def parse_file(self, file: str) -> str:
         """
         Parses a Python file and returns its AST dump as a string.
@@ -134,7 +322,25 @@ class Python_Extractor:
             with open(file) as f:
                 file_content = f.read()
 
-            parsed_ast = ast.parse(file_content)
+        except Exception as e:
+            logging.error(f"Error reading file {file}: {e}")
+            return ""
+
+        return self.parse_source(file_content, file)
+
+    def parse_source(self, source: str, file: str) -> str:
+        """
+        Parses Python source code and returns its pickled AST.
+
+        Args:
+            source (str): The Python source code to be parsed.
+            file (str): The path the source was read from, used for logging.
+
+        Returns:
+            str: The pickled Abstract Syntax Tree (AST) of the source.
+        """
+        try:
+            parsed_ast = ast.parse(source)
             parsed_dump = pickle.dumps(parsed_ast)
             return parsed_dump
 
@@ -0,0 +1,245 @@
+from .extractor import Python_Extractor, FileMetadata
+from .graph_generator import Knowledge_Graph
+from typing import Dict, List, Optional, Tuple, Union
+import networkx as nx
+import subprocess
+import logging
+
+logging.basicConfig(
+    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+"""
+Generate typing for the revision data and graph diffs
+"""
+FileData = Dict[str, Union[FileMetadata, str]]
+GraphDiff = Dict[str, List]
+
+
+class Git_Blob_Reader:
+    """
+    Reads blobs from the git object database through a single long-lived `git cat-file --batch` process.
+    """
+
+    def __init__(self, repo_path: str):
+        self.repo_path: str = repo_path
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        """
+        Starts the `git cat-file --batch` process if it is not already running.
+        """
+        if self.process is not None and self.process.poll() is None:
+            return
+
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def read(self, sha: str) -> Optional[bytes]:
+        """
+        Reads the content of a blob from the object database.
+
+        Args:
+            sha (str): The SHA of the blob to be read.
+
+        Returns:
+            bytes: The raw content of the blob, None if the object does not exist.
+        """
+        self.start()
+        self.process.stdin.write(f"{sha}\n".encode())
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline().decode().split()
+        if len(header) != 3:
+            logging.error(f"Error: object {sha} is missing from the repository.")
+            return None
+
+        size = int(header[2])
+        content = self.process.stdout.read(size)
+        # Each object is terminated by a newline that is not part of its content
+        self.process.stdout.read(1)
+        return content
+
+    def close(self) -> None:
+        """
+        Closes the `git cat-file --batch` process.
+        """
+        if self.process is None:
+            return
+
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+        self.process = None
+
+
+class Git_Extractor(Python_Extractor):
+    """
+    Extracts Python files straight from git revisions without checking them out.
+    Results are cached per blob SHA so files unchanged between revisions are only parsed once.
+    """
+
+    def __init__(self, repo_path: str):
+        super().__init__(repo_path)
+        self.reader = Git_Blob_Reader(repo_path)
+        self.blob_cache: Dict[str, Optional[FileData]] = {}
+
+    def list_files(self, revision: str) -> List[Tuple[str, str]]:
+        """
+        Lists the Python files of a revision along with their blob SHAs.
+
+        Args:
+            revision (str): Any git revision (commit, branch, tag) to list the files of.
+
+        Returns:
+            List[Tuple[str, str]]: (path, blob SHA) pairs, paths are relative to the repository root.
+        """
+        try:
+            output = subprocess.run(
+                ["git", "ls-tree", "-r", "-z", "--full-tree", revision],
+                cwd=self.root,
+                capture_output=True,
+                check=True,
+            ).stdout.decode(errors="surrogateescape")
+
+        except subprocess.CalledProcessError as e:
+            logging.error(
+                f"Error listing files of revision {revision}: {e.stderr.decode(errors='replace').strip()}"
+            )
+            return []
+
+        files = []
+        for entry in output.split("\0"):
+            if not entry:
+                continue
+
+            info, path = entry.split("\t", 1)
+            _, object_type, sha = info.split()
+            if object_type == "blob" and path.endswith(".py"):
+                files.append((path, sha))
+
+        return files
+
+    def collect_blob(self, path: str, sha: str) -> Optional[FileData]:
+        """
+        Collects both metadata and AST dump for a blob, reusing the cached result when the blob was seen before.
+
+        Args:
+            path (str): The path of the blob within the revision, used for logging.
+            sha (str): The SHA of the blob.
+
+        Returns:
+            dict: A dictionary containing both the metadata and the AST dump of the blob,
+                None if the blob cannot be read or parsed.
+        """
+        if sha in self.blob_cache:
+            return self.blob_cache[sha]
+
+        content = self.reader.read(sha)
+        if content is None:
+            return None
+
+        source = content.decode("utf-8", errors="replace")
+        data: Optional[FileData] = {
+            "metadata": self.track_source_metadata(source, path),
+            "ast_dump": self.parse_source(source, path),
+        }
+        if data["metadata"]["syntax_error"] or not data["ast_dump"]:
+            logging.warning(f"Skipping {path} ({sha}), it cannot be parsed.")
+            data = None
+
+        self.blob_cache[sha] = data
+        return data
+
+    def process_revision(self, revision: str) -> Dict[str, FileData]:
+        """
+        Collects data from all Python files of a git revision.
+
+        Args:
+            revision (str): Any git revision (commit, branch, tag) to extract.
+
+        Returns:
+            Dict: A dictionary in the schema of `process_codebase`, keyed by paths relative to the repository root.
+                Blobs that cannot be read or parsed are left out.
+        """
+        dataset: Dict[str, FileData] = {}
+
+        try:
+            for path, sha in self.list_files(revision):
+                data = self.collect_blob(path, sha)
+                if data is not None:
+                    dataset[path] = data
+            return dataset
+
+        except Exception as e:
+            logging.error(f"Error collecting data of revision {revision}: {e}")
+            return {}
+
+    def revision_graph(self, revision: str) -> Knowledge_Graph:
+        """
+        Generates the unified knowledge graph of a git revision.
+
+        Args:
+            revision (str): Any git revision (commit, branch, tag) to generate the graph of.
+
+        Returns:
+            Knowledge_Graph: The knowledge graph with its unified graph generated.
+        """
+        knowledge_graph = Knowledge_Graph(self.root, data=self.process_revision(revision))
+        knowledge_graph.generate_unified_graph()
+        return knowledge_graph
+
+    def diff_revisions(self, base: str, head: str) -> GraphDiff:
+        """
+        Computes the structural diff of the knowledge graph between two revisions.
+
+        Args:
+            base (str): The revision to diff from.
+            head (str): The revision to diff to.
+
+        Returns:
+            GraphDiff: A dictionary containing:
+                - "added_nodes" / "removed_nodes" / "changed_nodes" (List[str]): Definitions by name.
+                - "added_edges" / "removed_edges" (List[Tuple[str, str, str]]): Edges as (source, target, type).
+        """
+        return diff_graphs(
+            self.revision_graph(base).graph, self.revision_graph(head).graph
+        )
+
+    def close(self) -> None:
+        """
+        Closes the underlying blob reader.
+        """
+        self.reader.close()
+
+
+def diff_graphs(base: nx.DiGraph, head: nx.DiGraph) -> GraphDiff:
+    """
+    Computes the structural diff between two knowledge graphs.
+
+    Args:
+        base (nx.DiGraph): The graph to diff from.
+        head (nx.DiGraph): The graph to diff to.
+
+    Returns:
+        GraphDiff: Added, removed and changed nodes and added and removed edges, see `Git_Extractor.diff_revisions`.
+    """
+    base_edges = {(u, v, attrs.get("type")) for u, v, attrs in base.edges(data=True)}
+    head_edges = {(u, v, attrs.get("type")) for u, v, attrs in head.edges(data=True)}
+
+    return {
+        "added_nodes": sorted(node for node in head.nodes if node not in base),
+        "removed_nodes": sorted(node for node in base.nodes if node not in head),
+        "changed_nodes": sorted(
+            node
+            for node in head.nodes
+            if node in base and head.nodes[node] != base.nodes[node]
+        ),
+        "added_edges": sorted(head_edges - base_edges, key=str),
+        "removed_edges": sorted(base_edges - head_edges, key=str),
+    }
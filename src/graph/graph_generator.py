@@ -1,5 +1,6 @@
-from .extractor import Python_Extractor, FileMetadata
-from typing import Dict, Union
+from .extractor import Python_Extractor, FileMetadata, ParameterInfo
+from .metrics import Code_Metrics
+from typing import Dict, List, Optional, Union
 import networkx as nx
 import matplotlib.pyplot as plt
 import logging
@@ -22,12 +23,21 @@ class Knowledge_Graph(Python_Extractor):
             "path/to/file1.py": {
                 "metadata": {
                     "functions": [
-                        {"name": "func1", "args": ["arg1", "arg2"]},
-                        {"name": "func2", "args": ["arg1"]}
+                        {
+                            "name": "func1",
+                            "args": ["arg1", "arg2"],
+                            "params": [
+                                {"name": "arg1", "kind": "positional", "annotation": None, "default": None},
+                                {"name": "arg2", "kind": "positional", "annotation": None, "default": None}
+                            ],
+                            "metrics": {"complexity": 1, "nesting": 0, "loc": 2},
+                            "calls": ["print"]
+                        },
+                        {"name": "func2", "args": ["arg1"], "params": [...], "metrics": {...}, "calls": []}
                     ],
                     "classes": [
-                        {"name": "Class1", "bases": ["BaseClass"], "methods": ["method1", "method2"]},
-                        {"name": "Class2", "bases": [], "methods": ["method1"]}
+                        {"name": "Class1", "bases": ["BaseClass"], "methods": ["method1", "method2"], "metrics": {...}},
+                        {"name": "Class2", "bases": [], "methods": ["method1"], "metrics": {...}}
                     ],
                     "imports": ["os", "sys"],
                     "variables": ["var1", "var2"],
@@ -38,15 +48,21 @@ class Knowledge_Graph(Python_Extractor):
             ]
     """
 
-    def __init__(self, root_path: str):
+    def __init__(
+        self,
+        root_path: str,
+        data: Optional[Dict[str, Dict[str, Union[FileMetadata, str]]]] = None,
+    ):
         """Initializes the knowledge graph and extracts the data from the given root path
 
         Args:
             root_path (str): root path of the project
+            data (dict, optional): already extracted data in the schema of `process_codebase`,
+                the root path is not traversed when given
         """
         super().__init__(root_path)
         self.data: Dict[str, Dict[str, Union[FileMetadata, str]]] = (
-            self.process_codebase()
+            self.process_codebase() if data is None else data
         )
 
         self.graph = nx.DiGraph()
@@ -59,8 +75,7 @@ class Knowledge_Graph(Python_Extractor):
             for file, file_data in self.data.items():
                 classes = file_data["metadata"]["classes"]
                 functions = file_data["metadata"]["functions"]
-                ast_dump = file_data["ast_dump"]
-                pickled_load = pickle.loads(ast_dump)
+                sources = self.collect_sources(file_data)
                 function_to_class = {}
 
                 for class_info in classes:
@@ -71,18 +86,19 @@ class Knowledge_Graph(Python_Extractor):
 
                 for class_info in classes:
                     class_name = class_info["name"]
-                    source = self.get_class_source(pickled_load, class_name)
+                    source = sources["classes"][class_name]
                     self.graph.add_node(
                         class_name,
                         type="class",
                         file=file,
                         source=source,
+                        **class_info.get("metrics", {}),
                     )
 
                 for function_info in functions:
                     function_name = function_info["name"]
                     class_name = function_to_class.get(function_name)
-                    source = self.get_function_source(pickled_load, function_name)
+                    source = sources["functions"][function_name]
                     if class_name:
                         self.graph.add_node(
                             function_name,
@@ -90,6 +106,7 @@ class Knowledge_Graph(Python_Extractor):
                             parent_object=class_name,
                             file=file,
                             source=source,
+                            **function_info.get("metrics", {}),
                         )
 
                         self.graph.add_edge(
@@ -105,6 +122,7 @@ class Knowledge_Graph(Python_Extractor):
                             object=None,
                             file=file,
                             source=source,
+                            **function_info.get("metrics", {}),
                         )
 
             logging.info("Nodes added successfully")
@@ -114,6 +132,37 @@ class Knowledge_Graph(Python_Extractor):
             logging.error(f"Error adding nodes: {e}")
             return False
 
+    def collect_sources(
+        self, file_data: Dict[str, Union[FileMetadata, str]]
+    ) -> Dict[str, Dict[str, str]]:
+        """Renders the source of every class and function of a file from its AST dump
+
+        The sources are memoized on the file data under "sources", so data that is reused across graphs
+        (e.g. cached per git blob) is only unpickled and rendered once.
+
+        Returns:
+            Dict[str, Dict[str, str]]: the sources of the "classes" and "functions" keyed by name
+        """
+        if "sources" in file_data:
+            return file_data["sources"]
+
+        pickled_load = pickle.loads(file_data["ast_dump"])
+        metadata = file_data["metadata"]
+        sources = {
+            "classes": {
+                class_info["name"]: self.get_class_source(pickled_load, class_info["name"])
+                for class_info in metadata["classes"]
+            },
+            "functions": {
+                function_info["name"]: self.get_function_source(
+                    pickled_load, function_info["name"]
+                )
+                for function_info in metadata["functions"]
+            },
+        }
+        file_data["sources"] = sources
+        return sources
+
     def get_function_source(self, tree: ast.AST, name: str) -> str:
         """Recursively obtain the source code of a function by navigating the AST."""
         if tree is None or name is None:
@@ -175,20 +224,106 @@ class Knowledge_Graph(Python_Extractor):
             logging.error(f"Error adding inheritance edges: {e}")
             return False
 
-    def add_function_edges(self) -> bool:
-        """Adds function argument edges to the graph, excluding `self`"""
+    def function_parameters(self, function_info: Dict) -> List[ParameterInfo]:
+        """Parameter records of a function, falling back to its positional `args` for data extracted without them"""
+        return function_info.get("params") or [
+            {"name": arg, "kind": "positional", "annotation": None, "default": None}
+            for arg in function_info["args"]
+        ]
+
+    def add_call_edges(self) -> bool:
+        """Adds call edges from every function to the functions and classes it calls by name
+
+        Calls to names not defined in the graph (builtins, imported libraries) are left out, as are recursive calls.
+
+        Returns:
+            bool: true if edges are added successfully, false otherwise
+        """
         try:
-            logging.info("Adding function argument edges to the graph")
+            logging.info("Adding call edges to the graph")
+            for file in self.data:
+                for function_info in self.data[file]["metadata"]["functions"]:
+                    caller = function_info["name"]
+                    for callee in function_info.get("calls", []):
+                        callee_type = self.graph.nodes.get(callee, {}).get("type")
+                        if (
+                            callee != caller
+                            and callee_type in ("function", "class")
+                            and not self.graph.has_edge(caller, callee)
+                        ):
+                            self.graph.add_edge(caller, callee, type="calls", file=file)
+
+            logging.info("Call edges added successfully")
+            return True
+
+        except Exception as e:
+            logging.error(f"Error adding call edges: {e}")
+            return False
+
+    def add_function_signatures(self) -> bool:
+        """Stores the signature of every function on its node rather than as shared argument nodes
+
+        Each function node gets a `signature` string such as `(path: str, *, mode='r')` and the list of its
+        `parameters` names, the full per-parameter records stay in the extracted metadata.
+
+        Returns:
+            bool: true if the signatures are added successfully, false otherwise
+        """
+        try:
+            logging.info("Adding function signatures to the graph")
             for file in self.data:
                 for function_info in self.data[file]["metadata"]["functions"]:
                     function_name = function_info["name"]
+                    if self.graph.nodes.get(function_name, {}).get("type") != "function":
+                        continue
 
-                    for arg in function_info["args"]:
-                        if arg != "self":
-                            if not self.graph.has_node(arg):
-                                self.graph.add_node(arg, type="argument")
+                    params = self.function_parameters(function_info)
+                    self.graph.nodes[function_name]["signature"] = format_signature(params)
+                    self.graph.nodes[function_name]["parameters"] = [
+                        param["name"] for param in params
+                    ]
 
-                            self.graph.add_edge(arg, function_name, type="function_arg")
+            logging.info("Function signatures added successfully")
+            return True
+
+        except Exception as e:
+            logging.error(f"Error adding function signatures: {e}")
+            return False
+
+    def add_function_edges(self, max_degree: int = 50) -> bool:
+        """Adds a shared parameter name index as argument nodes linked to the functions using them, excluding `self` and `cls`
+
+        Names used by more than `max_degree` functions (e.g. `path`, `x`, `data`) are left out, as they would become
+        supernodes that every neighborhood query fans out through.
+
+        Args:
+            max_degree (int): maximum number of functions an argument node may be linked to
+
+        Returns:
+            bool: true if edges are added successfully, false otherwise
+        """
+        try:
+            logging.info("Adding function argument edges to the graph")
+            users: Dict[str, set] = {}
+            for file in self.data:
+                for function_info in self.data[file]["metadata"]["functions"]:
+                    for param in self.function_parameters(function_info):
+                        if param["name"] not in ("self", "cls"):
+                            users.setdefault(param["name"], set()).add(
+                                function_info["name"]
+                            )
+
+            for arg, function_names in users.items():
+                if len(function_names) > max_degree:
+                    logging.debug(
+                        f"Skipping argument {arg} shared by {len(function_names)} functions"
+                    )
+                    continue
+
+                if not self.graph.has_node(arg):
+                    self.graph.add_node(arg, type="argument")
+                for function_name in function_names:
+                    self.graph.add_edge(arg, function_name, type="function_arg")
 
             logging.info("Function argument edges added successfully")
             return True
@@ -197,9 +332,13 @@ class Knowledge_Graph(Python_Extractor):
             logging.error(f"Error adding function argument edges: {e}")
             return False
 
-    def generate_unified_graph(self) -> bool:
+    def generate_unified_graph(self, parameter_index_degree: Optional[int] = None) -> bool:
         """Generates a unified graph based on the given data from extraction
 
+        Args:
+            parameter_index_degree (int, optional): adds the shared parameter name index capped at this degree,
+                see `add_function_edges`, no argument nodes are added when not given
+
         Returns:
             bool: true if the graph is generated, false otherwise
         """
@@ -207,7 +346,10 @@ class Knowledge_Graph(Python_Extractor):
             logging.info("Generating unified graph")
             self.add_nodes()
             self.add_inheritance_edges()
-            self.add_function_edges()
+            self.add_function_signatures()
+            self.add_call_edges()
+            if parameter_index_degree is not None:
+                self.add_function_edges(parameter_index_degree)
             logging.info("Unified graph generated successfully")
             return True
 
@@ -215,6 +357,14 @@ class Knowledge_Graph(Python_Extractor):
             logging.error(f"Error generating unified graph: {e}")
             return False
 
+    def compute_metrics(self) -> Code_Metrics:
+        """Collects the metrics of the generated graph into columnar arrays for ranking
+
+        Returns:
+            Code_Metrics: the metrics aligned with the node order of the graph
+        """
+        return Code_Metrics(self.graph)
+
     def visualize_graph(self) -> bool:
         """Visualizes the graph using matplotlib with different colors for each node type
 
@@ -266,3 +416,39 @@ class Knowledge_Graph(Python_Extractor):
         except Exception as e:
             logging.error(f"Error printing graph data: {e}")
             return False
+
+
+def format_signature(params: List[ParameterInfo]) -> str:
+    """Formats parameter records back into a signature
+
+    Args:
+        params (List[ParameterInfo]): the parameters of a function as tracked by the extractor
+
+    Returns:
+        str: the signature, e.g. `(a, /, b: int = 1, *args, c, **kwargs)`
+    """
+    parts = []
+    for i, param in enumerate(params):
+        kind = param["kind"]
+        if kind == "keyword_only" and not any(
+            p["kind"] in ("vararg", "keyword_only") for p in params[:i]
+        ):
+            parts.append("*")
+
+        part = param["name"]
+        if kind == "vararg":
+            part = f"*{part}"
+        elif kind == "varkw":
+            part = f"**{part}"
+        if param["annotation"]:
+            part += f": {param['annotation']}"
+        if param["default"]:
+            part += f" = {param['default']}" if param["annotation"] else f"={param['default']}"
+        parts.append(part)
+
+        if kind == "positional_only" and (
+            i + 1 == len(params) or params[i + 1]["kind"] != "positional_only"
+        ):
+            parts.append("/")
+
+    return f"({', '.join(parts)})"
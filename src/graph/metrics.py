@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional, Tuple
+import networkx as nx
+import numpy as np
+import logging
+
+logging.basicConfig(
+    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+"""
+Metrics tracked by the extractor on function and class nodes, and metrics derived from the graph
+"""
+NODE_METRICS = ("complexity", "nesting", "loc")
+GRAPH_METRICS = ("fan_in", "fan_out")
+METRICS = NODE_METRICS + GRAPH_METRICS
+
+"""
+Edge types counted towards fan-in (afferent coupling, how many depend on a node) and fan-out (efferent
+coupling, how many a node depends on). Structural edges such as `belongs_to_class` or the shared parameter
+index say nothing about coupling and are left out. Calls point from the caller to the callee it depends on,
+inheritance points from the base to the subclass depending on it and is counted in reverse.
+"""
+COUPLING_EDGES = ("calls", "inheritance")
+REVERSED_EDGES = ("inheritance",)
+
+
+class Code_Metrics:
+    """
+    Columnar store of the code metrics of a knowledge graph for fast repo-wide ranking.
+    Every metric is a NumPy array aligned with the node order of the graph, nodes without
+    a metric (e.g. argument nodes or undefined bases) hold -1 and are left out of every query.
+    """
+
+    def __init__(
+        self, graph: nx.DiGraph, coupling_edges: Tuple[str, ...] = COUPLING_EDGES
+    ):
+        """Collects the metrics of every node of the graph
+
+        Args:
+            graph (nx.DiGraph): the knowledge graph, with metrics tracked on its function and class nodes
+            coupling_edges (Tuple[str, ...]): edge types counted towards fan-in and fan-out, see `COUPLING_EDGES`
+        """
+        self.nodes = np.array(list(graph.nodes), dtype=object)
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+        self.types = np.array(
+            [attrs.get("type", "") for _, attrs in graph.nodes(data=True)], dtype=object
+        )
+        measured = np.isin(self.types, ("function", "class"))
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for metric in NODE_METRICS:
+            self.columns[metric] = np.fromiter(
+                (attrs.get(metric, -1) for _, attrs in graph.nodes(data=True)),
+                dtype=np.int32,
+                count=len(self.nodes),
+            )
+        dependents, dependencies = [], []
+        for u, v, edge_type in graph.edges(data="type"):
+            if edge_type in coupling_edges:
+                if edge_type in REVERSED_EDGES:
+                    u, v = v, u
+                dependents.append(self.index[u])
+                dependencies.append(self.index[v])
+        fan_in = np.bincount(
+            np.array(dependencies, dtype=np.int64), minlength=len(self.nodes)
+        )
+        fan_out = np.bincount(
+            np.array(dependents, dtype=np.int64), minlength=len(self.nodes)
+        )
+        self.columns["fan_in"] = np.where(measured, fan_in, -1).astype(np.int32)
+        self.columns["fan_out"] = np.where(measured, fan_out, -1).astype(np.int32)
+
+    def column(self, metric: str) -> np.ndarray:
+        """Returns the array of a metric, raising a ValueError for unknown metrics"""
+        if metric not in self.columns:
+            raise ValueError(f"Unknown metric {metric}, expected one of {METRICS}")
+        return self.columns[metric]
+
+    def mask(self, metric: str, type: Optional[str] = None) -> np.ndarray:
+        """Boolean mask of the nodes having a metric, optionally restricted to a node type"""
+        mask = self.column(metric) >= 0
+        if type is not None:
+            mask &= self.types == type
+        return mask
+
+    def value(self, node: str, metric: str) -> Optional[int]:
+        """Looks up the metric of a single node, None if the node has no such metric"""
+        if node not in self.index:
+            return None
+        value = int(self.column(metric)[self.index[node]])
+        return value if value >= 0 else None
+
+    def top(
+        self, metric: str, n: int = 10, type: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        """Ranks the nodes with the highest values of a metric
+
+        Args:
+            metric (str): one of `METRICS`
+            n (int): number of nodes to return
+            type (str, optional): restricts the ranking to "function" or "class" nodes
+
+        Returns:
+            List[Tuple[str, int]]: (node, value) pairs in descending order of value
+        """
+        candidates = np.flatnonzero(self.mask(metric, type))
+        values = self.column(metric)[candidates]
+        if n <= 0 or len(candidates) == 0:
+            return []
+
+        if n < len(candidates):
+            # Partial selection of the top n before sorting only those
+            selected = np.argpartition(-values, n - 1)[:n]
+        else:
+            selected = np.arange(len(candidates))
+        selected = selected[np.argsort(-values[selected], kind="stable")]
+
+        return [(self.nodes[candidates[i]], int(values[i])) for i in selected]
+
+    def percentile(
+        self, metric: str, q: float, type: Optional[str] = None
+    ) -> Optional[float]:
+        """Computes a percentile of a metric across the repository
+
+        Args:
+            metric (str): one of `METRICS`
+            q (float): percentile between 0 and 100
+            type (str, optional): restricts the computation to "function" or "class" nodes
+
+        Returns:
+            float: the percentile, None if no node has the metric
+        """
+        values = self.column(metric)[self.mask(metric, type)]
+        if len(values) == 0:
+            return None
+        return float(np.percentile(values, q))
+
+    def threshold(
+        self, metric: str, minimum: int, type: Optional[str] = None
+    ) -> List[str]:
+        """Finds the nodes whose metric is at least a given value, e.g. overly complex functions
+
+        Args:
+            metric (str): one of `METRICS`
+            minimum (int): smallest value to report
+            type (str, optional): restricts the search to "function" or "class" nodes
+
+        Returns:
+            List[str]: the matching nodes in graph order
+        """
+        mask = self.mask(metric, type) & (self.column(metric) >= minimum)
+        return list(self.nodes[mask])
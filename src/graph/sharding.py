@@ -0,0 +1,312 @@
+from .extractor import Python_Extractor
+from .graph_generator import Knowledge_Graph
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import networkx as nx
+import hashlib
+import logging
+import pickle
+import os
+
+logging.basicConfig(
+    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+"""
+Files marking the root of a package, every Python file belongs to the shard of its nearest package root
+"""
+PACKAGE_MARKERS = ("pyproject.toml", "setup.py", "setup.cfg")
+
+"""
+Generate typing for the shards
+"""
+PendingEdge = Tuple[str, str, Dict[str, str]]
+ShardResult = Dict[str, object]
+
+
+def shard_node_id(shard: str, name: str) -> str:
+    """Deterministic ID of a class or function node defined within a shard
+
+    Args:
+        shard (str): package root of the shard, relative to the root of the tree
+        name (str): name of the class or function
+
+    Returns:
+        str: the node ID, `<shard>::<name>`
+    """
+    return f"{shard}::{name}"
+
+
+def build_shard(root: str, shard: str, files: List[str]) -> ShardResult:
+    """Builds the nodes and intra-shard edges of a single shard, runs in a worker process
+
+    Args:
+        root (str): root path of the tree
+        shard (str): package root of the shard, relative to the root of the tree
+        files (List[str]): Python files belonging to the shard
+
+    Returns:
+        ShardResult: a dictionary containing:
+            - "graph" (nx.DiGraph): class and function nodes under shard IDs, argument nodes and intra-shard edges
+            - "pending" (List[PendingEdge]): inheritance edges from bases not defined in the shard, resolved on merge
+            - "pending_calls" (List[PendingEdge]): calls to names not defined in the shard, resolved on merge
+
+        Files that cannot be parsed are skipped, as are edges to nodes not defined in the shard.
+    """
+    extractor = Python_Extractor(root)
+    data = {}
+    for file in files:
+        file_data = extractor.collect_metadata_and_ast(file)
+        if file_data["metadata"]["syntax_error"] or not file_data["ast_dump"]:
+            logging.warning(f"Skipping {file} in shard {shard}, it cannot be parsed.")
+            continue
+        data[file] = file_data
+    knowledge_graph = Knowledge_Graph(root, data=data)
+    knowledge_graph.generate_unified_graph()
+
+    graph = nx.DiGraph()
+    node_ids: Dict[str, str] = {}
+    definitions = set()
+    for node, attrs in knowledge_graph.graph.nodes(data=True):
+        node_type = attrs.get("type")
+        if node_type in ("class", "function"):
+            node_ids[node] = shard_node_id(shard, node)
+            definitions.add(node)
+            if attrs.get("parent_object"):
+                attrs = {
+                    **attrs,
+                    "parent_object": shard_node_id(shard, attrs["parent_object"]),
+                }
+            graph.add_node(node_ids[node], shard=shard, **attrs)
+        elif node_type == "argument":
+            node_ids[node] = node
+            graph.add_node(node, **attrs)
+
+    pending: List[PendingEdge] = []
+    for u, v, attrs in knowledge_graph.graph.edges(data=True):
+        if v not in node_ids:
+            # Edges only ever point at definitions, an untyped target was never defined in the shard
+            logging.debug(f"Skipping edge {u} -> {v} to an undefined node in shard {shard}")
+        elif u not in node_ids:
+            pending.append((u, node_ids[v], attrs))
+        else:
+            graph.add_edge(node_ids[u], node_ids[v], **attrs)
+
+    pending_calls: List[PendingEdge] = []
+    for file, file_data in data.items():
+        for function_info in file_data["metadata"]["functions"]:
+            caller = function_info["name"]
+            for callee in function_info.get("calls", []):
+                if (
+                    caller in definitions
+                    and callee != caller
+                    and callee not in definitions
+                ):
+                    pending_calls.append(
+                        (node_ids[caller], callee, {"type": "calls", "file": file})
+                    )
+
+    return {"graph": graph, "pending": pending, "pending_calls": pending_calls}
+
+
+class Sharded_Knowledge_Graph:
+    """Knowledge graph built per package shard and merged into one graph
+
+    Each shard is built independently in a worker process and cached by a fingerprint of its files,
+    so regenerating after a change only rebuilds the affected shards before merging.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initializes the sharded knowledge graph
+
+        Args:
+            root_path (str): root path of the tree
+            cache_dir (str, optional): directory to persist built shards in between runs
+            max_workers (int, optional): number of worker processes, defaults to the number of CPUs
+        """
+        self.root: str = root_path
+        self.cache_dir: Optional[str] = cache_dir
+        self.max_workers: Optional[int] = max_workers
+        self.shards: Dict[str, Dict[str, object]] = {}
+        self.rebuilt_shards: List[str] = []
+        self.graph = nx.DiGraph()
+
+    def partition(self) -> Dict[str, List[str]]:
+        """Partitions the Python files of the tree by their nearest package root
+
+        Returns:
+            Dict[str, List[str]]: sorted files keyed by package root relative to the root of the tree,
+                files outside of any package belong to the `.` shard
+        """
+        partitions: Dict[str, List[str]] = {}
+        package_roots: Dict[str, str] = {}
+
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            parent = os.path.dirname(dirpath)
+            if any(marker in filenames for marker in PACKAGE_MARKERS):
+                shard = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+            else:
+                shard = package_roots.get(parent, ".")
+            package_roots[dirpath] = shard
+
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    partitions.setdefault(shard, []).append(
+                        os.path.join(dirpath, filename)
+                    )
+
+        return partitions
+
+    def fingerprint(self, files: List[str]) -> str:
+        """Fingerprints the content of the files of a shard
+
+        Args:
+            files (List[str]): Python files belonging to the shard
+
+        Returns:
+            str: hex digest changing whenever a file is added, removed or edited
+        """
+        digest = hashlib.sha1()
+        for file in files:
+            digest.update(os.path.relpath(file, self.root).encode())
+            with open(file, "rb") as f:
+                digest.update(hashlib.sha1(f.read()).digest())
+        return digest.hexdigest()
+
+    def cache_path(self, shard: str) -> str:
+        """Path of the cached build of a shard"""
+        name = hashlib.sha1(shard.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pickle")
+
+    def load_cached_shard(self, shard: str, fingerprint: str) -> Optional[ShardResult]:
+        """Loads the build of a shard from memory or the cache directory if its fingerprint is unchanged"""
+        cached = self.shards.get(shard)
+        if cached is None and self.cache_dir:
+            try:
+                with open(self.cache_path(shard), "rb") as f:
+                    cached = pickle.load(f)
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable cache of shard {shard}: {e}")
+                return None
+
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            return cached
+        return None
+
+    def store_cached_shard(self, shard: str, cached: Dict[str, object]) -> None:
+        """Stores the build of a shard in memory and the cache directory"""
+        self.shards[shard] = cached
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.cache_path(shard), "wb") as f:
+                pickle.dump(cached, f)
+
+    def build_shards(self) -> bool:
+        """Builds every shard whose files changed since the last build in worker processes
+
+        Returns:
+            bool: true if the shards are built successfully, false otherwise
+        """
+        try:
+            partitions = self.partition()
+            fingerprints = {
+                shard: self.fingerprint(files) for shard, files in partitions.items()
+            }
+            stale = []
+            for shard in partitions:
+                cached = self.load_cached_shard(shard, fingerprints[shard])
+                if cached is None:
+                    stale.append(shard)
+                else:
+                    self.shards[shard] = cached
+
+            for shard in set(self.shards) - set(partitions):
+                del self.shards[shard]
+
+            logging.info(
+                f"Building {len(stale)} of {len(partitions)} shards, {len(partitions) - len(stale)} cached"
+            )
+            if stale:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = {
+                        shard: executor.submit(
+                            build_shard, self.root, shard, partitions[shard]
+                        )
+                        for shard in stale
+                    }
+                    for shard, future in futures.items():
+                        cached = {"fingerprint": fingerprints[shard], **future.result()}
+                        self.store_cached_shard(shard, cached)
+
+            self.rebuilt_shards = stale
+            return True
+
+        except Exception as e:
+            logging.error(f"Error building shards: {e}")
+            return False
+
+    def merge(self) -> nx.DiGraph:
+        """Merges the shards into one graph and resolves the cross-shard inheritance and call edges
+
+        Bases are resolved by name against the classes of the other shards, taking the first shard in sorted
+        order when several define it. Bases defined nowhere are kept as bare nodes like in `Knowledge_Graph`.
+        Calls are resolved the same way against functions and classes, calls to names defined nowhere are dropped.
+
+        Returns:
+            nx.DiGraph: the merged graph
+        """
+        graph = nx.DiGraph()
+        classes: Dict[str, List[str]] = {}
+        definitions: Dict[str, List[str]] = {}
+
+        for shard in sorted(self.shards):
+            shard_graph = self.shards[shard]["graph"]
+            graph.update(shard_graph)
+            for node, attrs in shard_graph.nodes(data=True):
+                if attrs.get("type") in ("class", "function"):
+                    name = node.split("::", 1)[1]
+                    definitions.setdefault(name, []).append(node)
+                    if attrs.get("type") == "class":
+                        classes.setdefault(name, []).append(node)
+
+        for shard in sorted(self.shards):
+            for base, target, attrs in self.shards[shard]["pending"]:
+                candidates = classes.get(base, [])
+                if len(candidates) > 1:
+                    logging.debug(
+                        f"Base {base} of {target} is ambiguous, resolving to {candidates[0]}"
+                    )
+                graph.add_edge(candidates[0] if candidates else base, target, **attrs)
+
+            for caller, callee, attrs in self.shards[shard].get("pending_calls", []):
+                candidates = definitions.get(callee, [])
+                if candidates and not graph.has_edge(caller, candidates[0]):
+                    graph.add_edge(caller, candidates[0], **attrs)
+
+        return graph
+
+    def generate_unified_graph(self) -> bool:
+        """Builds the stale shards and merges every shard into the unified graph
+
+        Returns:
+            bool: true if the graph is generated, false otherwise
+        """
+        try:
+            logging.info("Generating sharded graph")
+            if not self.build_shards():
+                return False
+            self.graph = self.merge()
+            logging.info("Sharded graph generated successfully")
+            return True
+
+        except Exception as e:
+            logging.error(f"Error generating sharded graph: {e}")
+            return False
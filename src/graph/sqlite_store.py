@@ -0,0 +1,308 @@
+from typing import Dict, List, Optional
+import networkx as nx
+import hashlib
+import logging
+import sqlite3
+import json
+
+logging.basicConfig(
+    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+"""
+Generate typing for the rows returned by queries
+"""
+NodeRecord = Dict[str, object]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT,
+    file TEXT,
+    source TEXT,
+    attrs TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source_id INTEGER NOT NULL,
+    target_id INTEGER NOT NULL,
+    type TEXT,
+    attrs TEXT
+);
+"""
+
+"""
+Indexes are dropped before a bulk load and recreated afterwards, which is much faster than maintaining them per row
+"""
+INDEXES = {
+    "nodes_name": "CREATE UNIQUE INDEX IF NOT EXISTS nodes_name ON nodes (name)",
+    "nodes_type": "CREATE INDEX IF NOT EXISTS nodes_type ON nodes (type)",
+    "nodes_file": "CREATE INDEX IF NOT EXISTS nodes_file ON nodes (file)",
+    "edges_source": "CREATE INDEX IF NOT EXISTS edges_source ON edges (source_id)",
+    "edges_target": "CREATE INDEX IF NOT EXISTS edges_target ON edges (target_id)",
+}
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS nodes_fts
+USING fts5(name, source, content='nodes', content_rowid='id')
+"""
+
+NODE_COLUMNS = ("type", "file", "source")
+
+
+class SQLite_Store:
+    """
+    Embedded SQLite store of the knowledge graph, an alternative to Neo4j for CI and local use
+    """
+
+    def __init__(self, path: str):
+        """Opens (or creates) the store at the given path
+
+        Args:
+            path (str): path of the SQLite database file
+        """
+        self.path: str = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.has_fts: bool = self.create_fts()
+        self.create_indexes()
+
+    def create_fts(self) -> bool:
+        """Creates the full text search table on the node sources, if SQLite was built with FTS5"""
+        try:
+            self.connection.execute(FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Full text search on sources is unavailable: {e}")
+            return False
+
+    def create_indexes(self) -> None:
+        """Creates the lookup indexes on nodes and edges"""
+        for statement in INDEXES.values():
+            self.connection.execute(statement)
+
+    def drop_indexes(self) -> None:
+        """Drops the lookup indexes on nodes and edges"""
+        for index in INDEXES:
+            self.connection.execute(f"DROP INDEX IF EXISTS {index}")
+
+    def fingerprint(self, file: str) -> Optional[str]:
+        """Fingerprints the content of a file, None if it cannot be read from disk"""
+        try:
+            with open(file, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def load_networkx(self, graph: nx.DiGraph) -> bool:
+        """Replaces the content of the store with a NetworkX graph in a single bulk transaction
+
+        Args:
+            graph (nx.DiGraph): the knowledge graph to be stored
+
+        Returns:
+            bool: true if the graph is stored successfully, false otherwise
+        """
+        try:
+            logging.info("Loading NetworkX graph into SQLite store.")
+            node_ids: Dict[str, int] = {}
+            node_rows = []
+            for node_id, (node, attrs) in enumerate(graph.nodes(data=True), start=1):
+                node_ids[node] = node_id
+                extra = {k: v for k, v in attrs.items() if k not in NODE_COLUMNS}
+                node_rows.append(
+                    (
+                        node_id,
+                        str(node),
+                        attrs.get("type"),
+                        attrs.get("file"),
+                        attrs.get("source"),
+                        json.dumps(extra, default=str) if extra else None,
+                    )
+                )
+
+            edge_rows = []
+            for u, v, attrs in graph.edges(data=True):
+                extra = {k: val for k, val in attrs.items() if k != "type"}
+                edge_rows.append(
+                    (
+                        node_ids[u],
+                        node_ids[v],
+                        attrs.get("type"),
+                        json.dumps(extra, default=str) if extra else None,
+                    )
+                )
+
+            files = sorted({row[3] for row in node_rows if row[3]})
+            file_rows = [(file, self.fingerprint(file)) for file in files]
+
+            with self.connection:
+                # DDL does not open the implicit transaction, begin explicitly so a failed
+                # load also rolls back the dropped indexes
+                self.connection.execute("BEGIN")
+                self.drop_indexes()
+                self.connection.execute("DELETE FROM edges")
+                self.connection.execute("DELETE FROM nodes")
+                self.connection.execute("DELETE FROM files")
+                self.connection.executemany(
+                    "INSERT INTO nodes (id, name, type, file, source, attrs) VALUES (?, ?, ?, ?, ?, ?)",
+                    node_rows,
+                )
+                self.connection.executemany(
+                    "INSERT INTO edges (source_id, target_id, type, attrs) VALUES (?, ?, ?, ?)",
+                    edge_rows,
+                )
+                self.connection.executemany(
+                    "INSERT INTO files (path, fingerprint) VALUES (?, ?)", file_rows
+                )
+                self.create_indexes()
+                if self.has_fts:
+                    self.connection.execute(
+                        "INSERT INTO nodes_fts (nodes_fts) VALUES ('rebuild')"
+                    )
+
+            logging.info(
+                f"Stored {len(node_rows)} nodes, {len(edge_rows)} edges and {len(file_rows)} files."
+            )
+            return True
+
+        except Exception as e:
+            logging.error(f"Error loading NetworkX graph into SQLite store: {e}")
+            return False
+
+    def verify(self) -> Dict[str, int]:
+        """Counts the nodes and edges in the store
+
+        Returns:
+            Dict[str, int]: the number of "nodes" and "edges"
+        """
+        node_count = self.connection.execute("SELECT count(*) FROM nodes").fetchone()[0]
+        edge_count = self.connection.execute("SELECT count(*) FROM edges").fetchone()[0]
+        logging.info(f"SQLite store has {node_count} nodes and {edge_count} edges.")
+        return {"nodes": node_count, "edges": edge_count}
+
+    def to_record(self, row: sqlite3.Row) -> NodeRecord:
+        """Converts a node row into a dictionary with its extra attributes inlined"""
+        record = {key: row[key] for key in row.keys() if key not in ("id", "attrs")}
+        if row["attrs"]:
+            record.update(json.loads(row["attrs"]))
+        return record
+
+    def get_node(self, name: str) -> Optional[NodeRecord]:
+        """Looks up a node by its name
+
+        Args:
+            name (str): name of the node
+
+        Returns:
+            NodeRecord: the node and its attributes, None if it does not exist
+        """
+        row = self.connection.execute(
+            "SELECT * FROM nodes WHERE name = ?", (name,)
+        ).fetchone()
+        return self.to_record(row) if row else None
+
+    def find_nodes(
+        self, type: Optional[str] = None, file: Optional[str] = None
+    ) -> List[NodeRecord]:
+        """Looks up the nodes of a given type and / or file
+
+        Args:
+            type (str, optional): type of the nodes, e.g. "class" or "function"
+            file (str, optional): file the nodes are defined in
+
+        Returns:
+            List[NodeRecord]: the matching nodes ordered by name
+        """
+        conditions, params = [], []
+        if type is not None:
+            conditions.append("type = ?")
+            params.append(type)
+        if file is not None:
+            conditions.append("file = ?")
+            params.append(file)
+
+        query = "SELECT * FROM nodes"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        rows = self.connection.execute(query + " ORDER BY name", params).fetchall()
+        return [self.to_record(row) for row in rows]
+
+    def neighbors(self, name: str, direction: str = "both") -> List[NodeRecord]:
+        """Looks up the nodes connected to a node
+
+        Args:
+            name (str): name of the node
+            direction (str): "out" for successors, "in" for predecessors or "both"
+
+        Returns:
+            List[NodeRecord]: the connected nodes, each with the "edge_type" connecting them
+        """
+        queries = []
+        if direction in ("out", "both"):
+            queries.append(
+                "SELECT n.*, e.type AS edge_type FROM nodes m "
+                "JOIN edges e ON e.source_id = m.id JOIN nodes n ON n.id = e.target_id "
+                "WHERE m.name = ?"
+            )
+        if direction in ("in", "both"):
+            queries.append(
+                "SELECT n.*, e.type AS edge_type FROM nodes m "
+                "JOIN edges e ON e.target_id = m.id JOIN nodes n ON n.id = e.source_id "
+                "WHERE m.name = ?"
+            )
+
+        rows = self.connection.execute(
+            " UNION ALL ".join(queries), [name] * len(queries)
+        ).fetchall()
+        return [self.to_record(row) for row in rows]
+
+    def search_source(self, query: str, limit: int = 20) -> List[NodeRecord]:
+        """Full text search over the names and sources of the nodes
+
+        Args:
+            query (str): FTS5 query, e.g. "open AND file"
+            limit (int): maximum number of results
+
+        Returns:
+            List[NodeRecord]: the matching nodes ordered by relevance
+        """
+        if not self.has_fts:
+            logging.error("Full text search on sources is unavailable.")
+            return []
+
+        rows = self.connection.execute(
+            "SELECT n.* FROM nodes_fts JOIN nodes n ON n.id = nodes_fts.rowid "
+            "WHERE nodes_fts MATCH ? ORDER BY rank LIMIT ?",
+            (query, limit),
+        ).fetchall()
+        return [self.to_record(row) for row in rows]
+
+    def stale_files(self, files: List[str]) -> List[str]:
+        """Finds the files whose content changed since they were stored
+
+        Args:
+            files (List[str]): the files to check
+
+        Returns:
+            List[str]: the files that are new or whose fingerprint changed
+        """
+        stored = dict(self.connection.execute("SELECT path, fingerprint FROM files"))
+        return [
+            file
+            for file in files
+            if file not in stored or stored[file] != self.fingerprint(file)
+        ]
+
+    def close(self) -> None:
+        """
+        Closes the connection to the store.
+        """
+        self.connection.close()
@@ -0,0 +1,165 @@
+import pytest
+import os
+from unittest.mock import MagicMock
+from graph import builder as builder_module
+from graph.builder import builder
+from graph.sqlite_store import SQLite_Store
+
+
+class FakeSession:
+    """Records the rows merged per query and fails after a given number of runs"""
+
+    def __init__(self, database, fail_after=None):
+        self.database = database
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def run(self, query, rows=None):
+        if self.fail_after is not None:
+            if self.fail_after == 0:
+                raise ConnectionError("connection dropped")
+            self.fail_after -= 1
+        if rows is not None:
+            self.database.append((query, rows))
+        return MagicMock()
+
+
+@pytest.fixture
+def setup_builder(tmp_path, monkeypatch):
+    root = tmp_path / "src"
+    root.mkdir()
+    with open(root / "shapes.py", "w") as f:
+        f.write(
+            "class Shape:\n    def area(self, scale):\n        return scale\n\n"
+            "class Square(Shape):\n    def side(self, scale):\n        return scale\n"
+        )
+
+    monkeypatch.setattr(builder_module.GraphDatabase, "driver", MagicMock())
+    graph_builder = builder(
+        str(root),
+        uri="bolt://localhost:7687",
+        username="neo4j",
+        password="password",
+        checkpoint_path=str(tmp_path / "checkpoint.json"),
+        batch_size=1,
+    )
+    return graph_builder
+
+
+def test_neo4j_batches_are_grouped_and_sized(setup_builder):
+    batches = setup_builder.neo4j_batches()
+    assert all(len(rows) == 1 for _, rows in batches)
+    assert len(batches) == (
+        setup_builder.knowledge_graph.number_of_nodes()
+        + setup_builder.knowledge_graph.number_of_edges()
+    )
+    assert any("MERGE (n:`class`" in query for query, _ in batches)
+    assert any("[r:`belongs_to_class`]" in query for query, _ in batches)
+
+
+def test_load_resumes_from_checkpoint(setup_builder):
+    batches = setup_builder.neo4j_batches()
+    database = []
+    # One index per label is created before the batches
+    labels = len(setup_builder.expected_counts()["labels"])
+
+    setup_builder.driver.session.return_value = FakeSession(database, labels + 3)
+    assert not setup_builder.load_networkx_to_neo4j()
+    assert len(database) == 3
+    assert setup_builder.can_resume()
+
+    setup_builder.driver.session.return_value = FakeSession(database)
+    assert setup_builder.load_networkx_to_neo4j()
+    assert database == batches
+    assert not os.path.exists(setup_builder.checkpoint_path)
+    assert not setup_builder.can_resume()
+
+
+def test_checkpoint_of_other_graph_is_ignored(setup_builder):
+    setup_builder.write_checkpoint("other", 5)
+    assert not setup_builder.can_resume()
+
+
+def test_verify_neo4j_graph_compares_counts(setup_builder):
+    expected = setup_builder.expected_counts()
+    assert expected["labels"]["class"] == 2
+    assert expected["relationships"]["belongs_to_class"] == 2
+    actual = {**expected["labels"], **expected["relationships"]}
+
+    def run(query):
+        result = MagicMock()
+        name = query.split("`")[1]
+        result.single.return_value = [actual[name]]
+        return result
+
+    session = MagicMock()
+    session.__enter__.return_value.run.side_effect = run
+    setup_builder.driver.session.return_value = session
+    assert setup_builder.verify_neo4j_graph()
+
+    actual["inheritance"] = 0
+    assert not setup_builder.verify_neo4j_graph()
+
+
+def test_load_empty_graph(tmp_path, monkeypatch):
+    root = tmp_path / "empty"
+    root.mkdir()
+    monkeypatch.setattr(builder_module.GraphDatabase, "driver", MagicMock())
+    graph_builder = builder(
+        str(root),
+        uri="bolt://localhost:7687",
+        username="neo4j",
+        password="password",
+        checkpoint_path=str(tmp_path / "checkpoint.json"),
+    )
+    database = []
+    graph_builder.driver.session.return_value = FakeSession(database)
+    assert graph_builder.neo4j_batches() == []
+    assert graph_builder.load_networkx_to_neo4j()
+    assert database == []
+
+
+def test_load_already_completed(setup_builder):
+    batches = setup_builder.neo4j_batches()
+    setup_builder.write_checkpoint(setup_builder.graph_fingerprint(batches), len(batches))
+    database = []
+    setup_builder.driver.session.return_value = FakeSession(database)
+    assert setup_builder.load_networkx_to_neo4j()
+    assert database == []
+    assert not os.path.exists(setup_builder.checkpoint_path)
+
+
+def test_build_into_sqlite_store_keeps_it_open(tmp_path):
+    root = tmp_path / "src"
+    root.mkdir()
+    with open(root / "util.py", "w") as f:
+        f.write("def helper(x):\n    return x\n")
+
+    store = SQLite_Store(str(tmp_path / "graph.db"))
+    builder(str(root), store=store).build()
+    assert store.get_node("helper")["type"] == "function"
+    store.close()
+
+
+def test_build_skips_verify_when_store_load_fails(tmp_path):
+    root = tmp_path / "src"
+    root.mkdir()
+    store = MagicMock()
+    store.load_networkx.return_value = False
+    builder(str(root), store=store).build()
+    store.verify.assert_not_called()
+    store.close.assert_not_called()
+
+
+def test_batches_are_computed_once(setup_builder, monkeypatch):
+    neo4j_batches = MagicMock(wraps=setup_builder.neo4j_batches)
+    monkeypatch.setattr(setup_builder, "neo4j_batches", neo4j_batches)
+    setup_builder.driver.session.return_value = FakeSession([])
+    assert not setup_builder.can_resume()
+    assert setup_builder.load_networkx_to_neo4j()
+    assert neo4j_batches.call_count == 1
@@ -184,3 +184,61 @@ def test_track_metadata_invalid_python_file_with_mock(
     )
     assert len(result["functions"]) == 1
     assert len(result["classes"]) == 0
+
+
+def test_track_source_metadata_parameters():
+    extractor = Python_Extractor("test_files")
+    metadata = extractor.track_source_metadata(
+        "def f(a, /, b: int = 1, *args, c, d='x', **kwargs):\n    pass\n", "f.py"
+    )
+    params = metadata["functions"][0]["params"]
+    assert [(p["name"], p["kind"]) for p in params] == [
+        ("a", "positional_only"),
+        ("b", "positional"),
+        ("args", "vararg"),
+        ("c", "keyword_only"),
+        ("d", "keyword_only"),
+        ("kwargs", "varkw"),
+    ]
+    assert params[1]["annotation"] == "int"
+    assert params[1]["default"] == "1"
+    assert params[3]["default"] is None
+    assert params[4]["default"] == "'x'"
+
+
+def test_track_source_metadata_metrics():
+    extractor = Python_Extractor("test_files")
+    metadata = extractor.track_source_metadata(
+        "class Parser:\n"
+        "    def parse(self, tokens):\n"
+        "        for token in tokens:\n"
+        "            if token and token.valid:\n"
+        "                pass\n"
+        "            elif token:\n"
+        "                pass\n"
+        "        return [t for t in tokens if t]\n"
+        "    def reset(self):\n"
+        "        return None\n",
+        "parser.py",
+    )
+    functions = {f["name"]: f["metrics"] for f in metadata["functions"]}
+    assert functions["parse"] == {"complexity": 7, "nesting": 2, "loc": 7}
+    assert functions["reset"] == {"complexity": 1, "nesting": 0, "loc": 2}
+    assert metadata["classes"][0]["metrics"]["complexity"] == 8
+    assert metadata["classes"][0]["metrics"]["loc"] == 10
+
+
+def test_track_source_metadata_calls():
+    extractor = Python_Extractor("test_files")
+    metadata = extractor.track_source_metadata(
+        "def load(path):\n"
+        "    data = read(path)\n"
+        "    self.cache.store(data)\n"
+        "    def inner():\n"
+        "        return hidden()\n"
+        "    return Parser(data).parse()\n",
+        "load.py",
+    )
+    functions = {f["name"]: f["calls"] for f in metadata["functions"]}
+    assert functions["load"] == ["Parser", "parse", "read", "store"]
+    assert functions["inner"] == ["hidden"]
@@ -0,0 +1,127 @@
+import pytest
+import os
+import subprocess
+from graph.git_source import Git_Extractor
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def setup_repo(tmp_path):
+    repo = str(tmp_path)
+    git(repo, "init", "-q")
+    git(repo, "config", "user.email", "test@example.com")
+    git(repo, "config", "user.name", "test")
+
+    with open(os.path.join(repo, "shapes.py"), "w") as f:
+        f.write("class Shape:\n    def area(self):\n        return 0\n")
+    with open(os.path.join(repo, "util.py"), "w") as f:
+        f.write("def helper(x):\n    return x\n")
+    with open(os.path.join(repo, "notes.txt"), "w") as f:
+        f.write("Just some text\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "base")
+    base = git(repo, "rev-parse", "HEAD")
+
+    with open(os.path.join(repo, "shapes.py"), "w") as f:
+        f.write(
+            "class Shape:\n    def area(self):\n        return 1\n\n"
+            "class Square(Shape):\n    def side(self):\n        return 1\n"
+        )
+    git(repo, "commit", "-q", "-am", "head")
+    head = git(repo, "rev-parse", "HEAD")
+
+    extractor = Git_Extractor(repo)
+    yield {"extractor": extractor, "base": base, "head": head}
+    extractor.close()
+
+
+def test_process_revision_reads_python_blobs(setup_repo):
+    dataset = setup_repo["extractor"].process_revision(setup_repo["base"])
+    assert sorted(dataset) == ["shapes.py", "util.py"]
+    functions = dataset["util.py"]["metadata"]["functions"]
+    assert [(f["name"], f["args"]) for f in functions] == [("helper", ["x"])]
+
+
+def test_process_revision_reuses_unchanged_blobs(setup_repo):
+    extractor = setup_repo["extractor"]
+    base = extractor.process_revision(setup_repo["base"])
+    head = extractor.process_revision(setup_repo["head"])
+    assert head["util.py"] is base["util.py"]
+    assert head["shapes.py"] is not base["shapes.py"]
+    assert len(extractor.blob_cache) == 3
+
+
+def test_process_revision_unknown_revision(setup_repo):
+    assert setup_repo["extractor"].process_revision("does-not-exist") == {}
+
+
+def test_diff_revisions(setup_repo):
+    diff = setup_repo["extractor"].diff_revisions(
+        setup_repo["base"], setup_repo["head"]
+    )
+    assert diff["added_nodes"] == ["Square", "side"]
+    assert diff["removed_nodes"] == []
+    assert diff["changed_nodes"] == ["Shape", "area"]
+    assert ("Shape", "Square", "inheritance") in diff["added_edges"]
+    assert ("Square", "side", "belongs_to_class") in diff["added_edges"]
+    assert diff["removed_edges"] == []
+
+
+def test_unparsable_blob_is_skipped(setup_repo):
+    extractor = setup_repo["extractor"]
+    repo = extractor.root
+    with open(os.path.join(repo, "a_broken.py"), "w") as f:
+        f.write("def broken(:\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "broken")
+    broken = git(repo, "rev-parse", "HEAD")
+
+    dataset = extractor.process_revision(broken)
+    assert sorted(dataset) == ["shapes.py", "util.py"]
+
+    diff = extractor.diff_revisions(setup_repo["head"], broken)
+    assert diff["added_nodes"] == []
+    assert diff["removed_nodes"] == []
+
+
+def test_revision_graph_reuses_cached_sources(setup_repo):
+    extractor = setup_repo["extractor"]
+    first = extractor.revision_graph(setup_repo["head"]).graph
+    assert all("sources" in data for data in extractor.blob_cache.values())
+    second = extractor.revision_graph(setup_repo["head"]).graph
+    assert dict(second.nodes(data=True)) == dict(first.nodes(data=True))
+    assert "return 1" in second.nodes["side"]["source"]
+
+
+def test_list_files_from_subdirectory(setup_repo):
+    repo = setup_repo["extractor"].root
+    os.makedirs(os.path.join(repo, "sub"))
+    with open(os.path.join(repo, "sub", "m.py"), "w") as f:
+        f.write("def m():\n    pass\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "sub")
+
+    extractor = Git_Extractor(os.path.join(repo, "sub"))
+    try:
+        paths = [path for path, _ in extractor.list_files("HEAD")]
+        assert paths == ["shapes.py", "sub/m.py", "util.py"]
+    finally:
+        extractor.close()
+
+
+def test_list_files_non_utf8_path(setup_repo):
+    extractor = setup_repo["extractor"]
+    repo = extractor.root
+    with open(os.path.join(os.fsencode(repo), b"caf\xe9.py"), "w") as f:
+        f.write("def brew():\n    pass\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "latin-1")
+
+    dataset = extractor.process_revision("HEAD")
+    assert "caf\udce9.py" in dataset
+    assert "util.py" in dataset
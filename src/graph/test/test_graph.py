@@ -0,0 +1,86 @@
+import pytest
+from graph.graph_generator import Knowledge_Graph, format_signature
+
+
+@pytest.fixture
+def setup_graph(tmp_path):
+    with open(tmp_path / "io.py", "w") as f:
+        f.write(
+            "class Reader:\n"
+            "    def read(self, path, *, mode='r'):\n        return path\n\n"
+            "def write(path, data: bytes):\n    return path\n\n"
+            "def remove(path):\n    return path\n"
+        )
+    return Knowledge_Graph(str(tmp_path))
+
+
+def test_signatures_are_stored_on_function_nodes(setup_graph):
+    assert setup_graph.generate_unified_graph()
+    graph = setup_graph.graph
+    assert graph.nodes["read"]["signature"] == "(self, path, *, mode='r')"
+    assert graph.nodes["write"]["parameters"] == ["path", "data"]
+    assert not any(attrs["type"] == "argument" for _, attrs in graph.nodes(data=True))
+    assert graph.in_degree("write") == 0
+
+
+def test_parameter_index_is_degree_capped(setup_graph):
+    assert setup_graph.generate_unified_graph(parameter_index_degree=2)
+    graph = setup_graph.graph
+    assert not graph.has_node("path")
+    assert not graph.has_node("self")
+    assert graph.nodes["data"]["type"] == "argument"
+    assert graph.edges["data", "write"]["type"] == "function_arg"
+
+
+def test_format_signature():
+    params = [
+        {"name": "a", "kind": "positional_only", "annotation": None, "default": None},
+        {"name": "b", "kind": "positional", "annotation": "int", "default": "1"},
+        {"name": "c", "kind": "keyword_only", "annotation": None, "default": None},
+        {"name": "kwargs", "kind": "varkw", "annotation": None, "default": None},
+    ]
+    assert format_signature(params) == "(a, /, b: int = 1, *, c, **kwargs)"
+    assert format_signature([]) == "()"
+
+
+def test_compute_metrics(setup_graph):
+    assert setup_graph.generate_unified_graph()
+    metrics = setup_graph.compute_metrics()
+    assert metrics.value("read", "loc") == 2
+    assert metrics.value("Reader", "fan_out") == 0
+    assert metrics.value("read", "fan_in") == 0
+
+
+def test_parameter_index_covers_every_parameter_kind(tmp_path):
+    with open(tmp_path / "calls.py", "w") as f:
+        f.write(
+            "class Client:\n"
+            "    @classmethod\n"
+            "    def connect(cls, host, /, *retries, timeout=1, **options):\n"
+            "        return host\n"
+        )
+    knowledge_graph = Knowledge_Graph(str(tmp_path))
+    assert knowledge_graph.generate_unified_graph(parameter_index_degree=5)
+    graph = knowledge_graph.graph
+    for name in ("host", "retries", "timeout", "options"):
+        assert graph.edges[name, "connect"]["type"] == "function_arg"
+    assert not graph.has_node("cls")
+
+
+def test_call_edges(tmp_path):
+    with open(tmp_path / "app.py", "w") as f:
+        f.write(
+            "class Parser:\n    def parse(self):\n        return self.parse()\n\n"
+            "def run(text):\n    print(text)\n    return Parser().parse()\n"
+        )
+    knowledge_graph = Knowledge_Graph(str(tmp_path))
+    assert knowledge_graph.generate_unified_graph()
+    graph = knowledge_graph.graph
+    assert graph.edges["run", "Parser"]["type"] == "calls"
+    assert graph.edges["run", "parse"]["type"] == "calls"
+    assert not graph.has_edge("parse", "parse")
+    assert not graph.has_node("print")
+
+    metrics = knowledge_graph.compute_metrics()
+    assert metrics.value("run", "fan_out") == 2
+    assert metrics.value("parse", "fan_in") == 1
@@ -0,0 +1,78 @@
+import pytest
+import networkx as nx
+from graph.metrics import Code_Metrics
+
+
+@pytest.fixture
+def setup_metrics():
+    graph = nx.DiGraph()
+    graph.add_node("Parser", type="class", complexity=12, nesting=0, loc=80)
+    graph.add_node("parse", type="function", complexity=10, nesting=4, loc=60)
+    graph.add_node("reset", type="function", complexity=1, nesting=0, loc=3)
+    graph.add_node("tokenize", type="function", complexity=5, nesting=2, loc=20)
+    graph.add_node("Base")
+    graph.add_node("StrictParser", type="class", complexity=2, nesting=0, loc=10)
+    graph.add_node("LenientParser", type="class", complexity=2, nesting=0, loc=10)
+    graph.add_edge("Parser", "StrictParser", type="inheritance")
+    graph.add_edge("Parser", "LenientParser", type="inheritance")
+    graph.add_edge("Base", "Parser", type="inheritance")
+    graph.add_edge("Parser", "parse", type="belongs_to_class")
+    graph.add_edge("Parser", "reset", type="belongs_to_class")
+    graph.add_edge("parse", "tokenize", type="calls")
+    graph.add_edge("parse", "reset", type="calls")
+    graph.add_edge("reset", "tokenize", type="calls")
+    return Code_Metrics(graph)
+
+
+def test_top(setup_metrics):
+    assert setup_metrics.top("complexity", 2) == [("Parser", 12), ("parse", 10)]
+    assert setup_metrics.top("complexity", 2, type="function") == [
+        ("parse", 10),
+        ("tokenize", 5),
+    ]
+    assert setup_metrics.top("loc", 10, type="function")[-1] == ("reset", 3)
+    assert setup_metrics.top("loc", 0) == []
+
+
+def test_fan_in_fan_out(setup_metrics):
+    # Subclasses depend on their base
+    assert setup_metrics.value("Parser", "fan_in") == 2
+    assert setup_metrics.value("Parser", "fan_out") == 1
+    assert setup_metrics.value("StrictParser", "fan_out") == 1
+    assert setup_metrics.value("StrictParser", "fan_in") == 0
+    assert setup_metrics.value("Base", "fan_in") is None
+    # Callers depend on their callees, methods are not coupling
+    assert setup_metrics.value("tokenize", "fan_in") == 2
+    assert setup_metrics.value("parse", "fan_out") == 2
+    assert setup_metrics.value("parse", "fan_in") == 0
+    assert setup_metrics.value("reset", "fan_in") == 1
+    assert setup_metrics.top("fan_in", 2, type="function") == [
+        ("tokenize", 2),
+        ("reset", 1),
+    ]
+
+
+def test_coupling_edges():
+    graph = nx.DiGraph()
+    graph.add_node("Parser", type="class")
+    graph.add_node("parse", type="function")
+    graph.add_edge("Parser", "parse", type="belongs_to_class")
+    metrics = Code_Metrics(graph, coupling_edges=("belongs_to_class",))
+    assert metrics.value("Parser", "fan_out") == 1
+    assert metrics.value("parse", "fan_in") == 1
+
+
+def test_percentile(setup_metrics):
+    assert setup_metrics.percentile("complexity", 50, type="function") == 5.0
+    assert setup_metrics.percentile("complexity", 100) == 12.0
+    assert setup_metrics.percentile("complexity", 50, type="argument") is None
+
+
+def test_threshold(setup_metrics):
+    assert setup_metrics.threshold("nesting", 2) == ["parse", "tokenize"]
+    assert setup_metrics.threshold("complexity", 10, type="class") == ["Parser"]
+
+
+def test_unknown_metric(setup_metrics):
+    with pytest.raises(ValueError):
+        setup_metrics.top("coupling")
@@ -0,0 +1,76 @@
+import pytest
+import os
+from graph.sharding import Sharded_Knowledge_Graph
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+@pytest.fixture
+def setup_monorepo(tmp_path):
+    root = str(tmp_path / "repo")
+    write(os.path.join(root, "tools.py"), "def run(task):\n    return task\n")
+    write(os.path.join(root, "core", "pyproject.toml"), "")
+    write(
+        os.path.join(root, "core", "core", "base.py"),
+        "class Base:\n    def describe(self):\n        return 'base'\n",
+    )
+    write(os.path.join(root, "app", "setup.py"), "")
+    write(
+        os.path.join(root, "app", "app", "models.py"),
+        "class Model(Base):\n    def save(self, path):\n        return self.describe()\n\n"
+        "class Remote(Missing):\n    pass\n",
+    )
+    return {"root": root, "cache_dir": str(tmp_path / "cache")}
+
+
+def test_partition_by_package_root(setup_monorepo):
+    sharded = Sharded_Knowledge_Graph(setup_monorepo["root"])
+    partitions = sharded.partition()
+    assert sorted(partitions) == [".", "app", "core"]
+    assert [os.path.basename(f) for f in partitions["app"]] == ["setup.py", "models.py"]
+    assert [os.path.basename(f) for f in partitions["."]] == ["tools.py"]
+
+
+def test_merge_resolves_cross_shard_edges(setup_monorepo):
+    sharded = Sharded_Knowledge_Graph(setup_monorepo["root"], max_workers=2)
+    assert sharded.generate_unified_graph()
+    graph = sharded.graph
+    assert graph.nodes["core::Base"]["shard"] == "core"
+    assert graph.edges["core::Base", "app::Model"]["type"] == "inheritance"
+    assert graph.edges["app::Model", "app::save"]["type"] == "belongs_to_class"
+    assert graph.nodes["app::save"]["parent_object"] == "app::Model"
+    assert graph.edges["app::save", "core::describe"]["type"] == "calls"
+    assert graph.has_edge("Missing", "app::Remote")
+    assert graph.nodes["app::save"]["signature"] == "(self, path)"
+    assert not graph.has_node("path")
+
+
+def test_rebuild_only_affected_shard(setup_monorepo):
+    root = setup_monorepo["root"]
+    sharded = Sharded_Knowledge_Graph(root, cache_dir=setup_monorepo["cache_dir"])
+    assert sharded.generate_unified_graph()
+    assert sorted(sharded.rebuilt_shards) == [".", "app", "core"]
+
+    write(os.path.join(root, "core", "core", "extra.py"), "class Extra(Base):\n    pass\n")
+    reloaded = Sharded_Knowledge_Graph(root, cache_dir=setup_monorepo["cache_dir"])
+    assert reloaded.generate_unified_graph()
+    assert reloaded.rebuilt_shards == ["core"]
+    assert reloaded.graph.has_edge("core::Base", "core::Extra")
+    assert reloaded.graph.has_edge("core::Base", "app::Model")
+
+
+def test_broken_file_does_not_break_shard(setup_monorepo):
+    root = setup_monorepo["root"]
+    write(os.path.join(root, "pkg", "setup.cfg"), "")
+    write(os.path.join(root, "pkg", "a_broken.py"), "def broken(:\n")
+    write(os.path.join(root, "pkg", "b.py"), "class B(Exception):\n    pass\n")
+
+    sharded = Sharded_Knowledge_Graph(root)
+    assert sharded.generate_unified_graph()
+    assert sharded.graph.nodes["pkg::B"]["type"] == "class"
+    assert sharded.graph.has_edge("Exception", "pkg::B")
+    assert sharded.graph.has_node("core::Base")
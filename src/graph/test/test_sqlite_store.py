@@ -0,0 +1,103 @@
+import pytest
+import os
+import networkx as nx
+from graph.sqlite_store import SQLite_Store
+
+
+@pytest.fixture
+def setup_store(tmp_path):
+    source_file = str(tmp_path / "shapes.py")
+    with open(source_file, "w") as f:
+        f.write("class Shape:\n    def area(self, scale):\n        return scale\n")
+
+    graph = nx.DiGraph()
+    graph.add_node(
+        "Shape", type="class", file=source_file, source="class Shape:\n    pass\n"
+    )
+    graph.add_node(
+        "area",
+        type="function",
+        parent_object="Shape",
+        file=source_file,
+        source="def area(self, scale):\n    return scale\n",
+    )
+    graph.add_node("scale", type="argument")
+    graph.add_edge("Shape", "area", type="belongs_to_class", file=source_file)
+    graph.add_edge("scale", "area", type="function_arg")
+
+    store = SQLite_Store(str(tmp_path / "graph.db"))
+    assert store.load_networkx(graph)
+    yield {"store": store, "graph": graph, "source_file": source_file}
+    store.close()
+
+
+def test_load_networkx_counts(setup_store):
+    assert setup_store["store"].verify() == {"nodes": 3, "edges": 2}
+
+
+def test_load_networkx_replaces_content(setup_store):
+    store = setup_store["store"]
+    assert store.load_networkx(setup_store["graph"])
+    assert store.verify() == {"nodes": 3, "edges": 2}
+
+
+def test_get_node_inlines_attributes(setup_store):
+    node = setup_store["store"].get_node("area")
+    assert node["type"] == "function"
+    assert node["parent_object"] == "Shape"
+    assert setup_store["store"].get_node("missing") is None
+
+
+def test_find_nodes(setup_store):
+    store = setup_store["store"]
+    assert [n["name"] for n in store.find_nodes(type="function")] == ["area"]
+    assert [n["name"] for n in store.find_nodes(file=setup_store["source_file"])] == [
+        "Shape",
+        "area",
+    ]
+
+
+def test_neighbors(setup_store):
+    store = setup_store["store"]
+    assert [n["name"] for n in store.neighbors("Shape", direction="out")] == ["area"]
+    incoming = store.neighbors("area", direction="in")
+    assert sorted((n["name"], n["edge_type"]) for n in incoming) == [
+        ("Shape", "belongs_to_class"),
+        ("scale", "function_arg"),
+    ]
+
+
+def test_search_source(setup_store):
+    store = setup_store["store"]
+    if not store.has_fts:
+        pytest.skip("SQLite was built without FTS5")
+    assert [n["name"] for n in store.search_source("source: scale")] == ["area"]
+
+
+def test_stale_files(setup_store):
+    store = setup_store["store"]
+    source_file = setup_store["source_file"]
+    assert store.stale_files([source_file]) == []
+
+    with open(source_file, "a") as f:
+        f.write("\nclass Circle(Shape):\n    pass\n")
+    new_file = os.path.join(os.path.dirname(source_file), "new.py")
+    assert store.stale_files([source_file, new_file]) == [source_file, new_file]
+
+
+def test_failed_load_rolls_back(setup_store):
+    store = setup_store["store"]
+    graph = nx.DiGraph()
+    # Both nodes are stored under the name "1", recreating the unique name index fails
+    graph.add_node(1, type="function")
+    graph.add_node("1", type="function")
+    assert not store.load_networkx(graph)
+
+    assert store.verify() == {"nodes": 3, "edges": 2}
+    indexes = {
+        row[0]
+        for row in store.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {"nodes_name", "nodes_type", "nodes_file"} <= indexes
@@ -21,8 +21,9 @@ def main():
             password=os.getenv("NEO_PASSWORD")
         )
         
-        with graph_builder.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        if not graph_builder.can_resume():
+            with graph_builder.driver.session() as session:
+                session.run("MATCH (n) DETACH DELETE n")
 
         graph_builder.build()
     